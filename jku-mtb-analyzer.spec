@@ -17,6 +17,8 @@ hiddenimports = [
     'werkzeug',
     'werkzeug.serving',
     'werkzeug.debug',
+    'waitress',
+    'orjson',
     'sqlalchemy',
     'sqlalchemy.dialects.sqlite',
     'yaml',
@@ -52,6 +54,8 @@ hiddenimports = [
     'src.analyzer',
     'src.storage',
     'src.parser',
+    'src.rate_limiter',
+    'src.yaml_io',
 ]
 
 # Add SQLAlchemy dialects
@@ -30,8 +30,8 @@ def main():
         sys.path.insert(0, app_dir)
     
     # Import after setting up paths
-    import yaml
     from src.storage import get_storage
+    from src.yaml_io import load_yaml
     from src.ui import run_web_server
     
     # Configuration
@@ -54,7 +54,7 @@ def main():
     
     # Load config
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = load_yaml(f)
     
     # Store config path for saving changes
     config['_config_path'] = config_path
@@ -16,13 +16,13 @@ import sys
 from pathlib import Path
 
 import click
-import yaml
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.storage import get_storage
-from src.scraper import run_scraper, scrape_edition
+from src.yaml_io import load_yaml
+from src.scraper import run_scraper, scrape_edition, scrape_editions
 from src.analyzer import BulletinAnalyzer, analyze_edition_cli, analyze_all_cli
 from src.ui import (
     console, print_header, print_stats, print_editions_list,
@@ -39,7 +39,7 @@ def load_config(config_path: str = "config.yaml") -> dict:
         sys.exit(1)
     
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = load_yaml(f)
     
     # Validate required fields
     if not config.get('anthropic_api_key') or config['anthropic_api_key'].startswith('sk-ant-api03-your'):
@@ -113,12 +113,13 @@ def scrape(ctx, edition):
         
         console.print(f"[blue]Scraping {len(unscraped)} editions...[/blue]")
         
-        for ed in unscraped:
-            try:
-                console.print(f"  Scraping {ed.edition_id}...")
-                scrape_edition(storage, config, ed.year, ed.stueck)
-            except Exception as e:
-                console.print(f"  [red]Error: {e}[/red]")
+        def report(ed, num_items, error):
+            if error:
+                console.print(f"  [red]Error scraping {ed.edition_id}: {error}[/red]")
+            else:
+                console.print(f"  Scraped {num_items} items from {ed.edition_id}")
+        
+        scrape_editions(storage, config, unscraped, on_progress=report)
         
         console.print("[green]Scraping complete.[/green]")
         print_stats(storage)
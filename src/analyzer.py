@@ -3,7 +3,13 @@ AI Analyzer for JKU MTB content.
 Uses Claude Haiku for relevance scoring.
 """
 
+import asyncio
+import functools
+import hashlib
 import re
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
@@ -11,65 +17,250 @@ import anthropic
 
 from .storage import Storage, BulletinItem, Edition
 from .parser import PDFParser, ContentProcessor, process_bulletin_item
+from .rate_limiter import DEFAULT_RPM, DEFAULT_TPM, get_rate_limiter
+
+# Connection pool shared by all requests of a client; idle connections are
+# kept alive so consecutive calls skip the TCP/TLS handshake. Built from the
+# SDK's own Limits type so it matches the HTTP client the SDK ships with.
+CONNECTION_LIMITS = type(anthropic.DEFAULT_CONNECTION_LIMITS)(
+    max_connections=20,
+    max_keepalive_connections=10,
+    keepalive_expiry=30.0
+)
+
+# Patterns for the SCORE / EXPLANATION / KEY_POINTS response format
+_SCORE_RE = re.compile(r'SCORE:\s*(\d+(?:\.\d+)?)', re.IGNORECASE)
+_EXPLANATION_RE = re.compile(r'EXPLANATION:\s*(.+?)(?=KEY_POINTS:|$)', re.IGNORECASE | re.DOTALL)
+_KEY_POINTS_RE = re.compile(r'KEY_POINTS:\s*(.+?)$', re.IGNORECASE | re.DOTALL)
+
+# Result for items with neither text nor title; no API call is made
+EMPTY_ITEM_RESULT = (0.0, "Empty content - no analysis performed")
+
+# Analysis results for identical requests, shared by all analyzers.
+# Entries expire after a week; force=True skips the cache entirely.
+RESPONSE_CACHE_SIZE = 4096
+RESPONSE_CACHE_TTL = 7 * 86400
+_response_cache: "OrderedDict[str, Tuple[float, Tuple[float, str]]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key: str) -> anthropic.Anthropic:
+    """Get a shared client per API key so its connection pool is reused."""
+    return anthropic.Anthropic(
+        api_key=api_key,
+        http_client=anthropic.DefaultHttpxClient(limits=CONNECTION_LIMITS)
+    )
 
 
 class RelevanceAnalyzer:
     """Analyzes bulletin content for relevance using Claude Haiku."""
     
-    def __init__(self, api_key: str, model: str = "claude-3-5-haiku-20241022"):
-        """Initialize with Anthropic API key."""
-        self.client = anthropic.Anthropic(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "claude-3-5-haiku-20241022",
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None
+    ):
+        """
+        Initialize with Anthropic API key and optional rate limits (per minute).
+        
+        Requests are only paced when rpm or tpm is given; a missing one of
+        the two falls back to its default.
+        """
+        self.api_key = api_key
+        self.client = _get_client(api_key)
         self.model = model
+        self.rate_limiter = None
+        if rpm is not None or tpm is not None:
+            self.rate_limiter = get_rate_limiter(rpm or DEFAULT_RPM, tpm or DEFAULT_TPM)
     
     def analyze_item(
         self,
         content: str,
         role_description: str,
         item_title: str = "",
-        category: str = ""
+        category: str = "",
+        force: bool = False
     ) -> Tuple[float, str]:
         """
         Analyze a bulletin item for relevance.
         
         Returns (score, explanation) where score is 0-100.
+        With force=True a cached result is ignored and the API is called.
         """
-        prompt = self._build_analysis_prompt(content, role_description, item_title, category)
+        key, result = self._precheck(content, role_description, item_title, category, force)
+        if result:
+            return result
         
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            response_text = response.content[0].text
-            return self._parse_response(response_text)
+            params = self._message_params(content, role_description, item_title, category)
+            if self.rate_limiter:
+                self.rate_limiter.acquire(self._estimate_tokens(params))
+            response = self.client.messages.create(**params)
+            return self._handle_response(key, response)
+        
+        except Exception as e:
+            return self._error_result(e)
+    
+    async def analyze_item_async(
+        self,
+        client: anthropic.AsyncAnthropic,
+        content: str,
+        role_description: str,
+        item_title: str = "",
+        category: str = "",
+        force: bool = False
+    ) -> Tuple[float, str]:
+        """Async variant of analyze_item using the given async client."""
+        key, result = self._precheck(content, role_description, item_title, category, force)
+        if result:
+            return result
+        
+        try:
+            params = self._message_params(content, role_description, item_title, category)
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async(self._estimate_tokens(params))
+            response = await client.messages.create(**params)
+            return self._handle_response(key, response)
         
         except Exception as e:
-            print(f"API Error: {e}")
-            return 0.0, f"Error during analysis: {str(e)}"
+            return self._error_result(e)
     
-    def _build_analysis_prompt(
+    def _precheck(
+        self,
+        content: str,
+        role_description: str,
+        item_title: str,
+        category: str,
+        force: bool = False
+    ) -> Tuple[str, Optional[Tuple[float, str]]]:
+        """
+        Work out what an item needs before calling the API.
+        
+        Returns (cache key, result); result is set for empty items and
+        cache hits, which need no API call. force=True skips the cache.
+        """
+        key = self._cache_key(content, role_description, item_title, category)
+        if self._is_empty(content, item_title):
+            return key, EMPTY_ITEM_RESULT
+        if force:
+            return key, None
+        return key, self._cached_result(key)
+    
+    def _handle_response(self, key: str, response) -> Tuple[float, str]:
+        """Parse an API response and cache the result if it had a score."""
+        response_text = response.content[0].text
+        result = self._parse_response(response_text)
+        if _SCORE_RE.search(response_text):
+            self._store_result(key, result)
+        return result
+    
+    def _error_result(self, error: Exception) -> Tuple[float, str]:
+        """Report an API error and turn it into an analysis result."""
+        print(f"API Error: {error}")
+        return 0.0, f"Error during analysis: {str(error)}"
+    
+    def _is_empty(self, content: str, item_title: str) -> bool:
+        """Check whether an item has nothing to analyze."""
+        return not (content or '').strip() and not (item_title or '').strip()
+    
+    def _cache_key(
         self,
         content: str,
         role_description: str,
         item_title: str,
         category: str
     ) -> str:
-        """Build the prompt for relevance analysis."""
+        """Hash everything that determines the analysis result."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.model, role_description, item_title, category, content):
+            digest.update((part or '').encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+    
+    def _cached_result(self, key: str) -> Optional[Tuple[float, str]]:
+        """Return an unexpired cached result and mark it as recently used."""
+        with _response_cache_lock:
+            entry = _response_cache.get(key)
+            if not entry:
+                return None
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                del _response_cache[key]
+                return None
+            _response_cache.move_to_end(key)
+            return result
+    
+    def _store_result(self, key: str, result: Tuple[float, str]):
+        """Cache a successful result, evicting the least recently used."""
+        with _response_cache_lock:
+            _response_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL, result)
+            _response_cache.move_to_end(key)
+            if len(_response_cache) > RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+    
+    def _message_params(
+        self,
+        content: str,
+        role_description: str,
+        item_title: str = "",
+        category: str = ""
+    ) -> Dict:
+        """
+        Build the Messages API parameters for analyzing one item.
+        
+        The role part of the prompt is identical for every item, so it is a
+        separate block marked for prompt caching; later items of the same
+        run read it from the cache at a fraction of the input token price.
+        """
+        return {
+            "model": self.model,
+            "max_tokens": 1000,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": self._build_role_prompt(role_description),
+                            "cache_control": {"type": "ephemeral"},
+                        },
+                        {
+                            "type": "text",
+                            "text": self._build_item_prompt(content, item_title, category),
+                        },
+                    ],
+                }
+            ],
+        }
+    
+    def _estimate_tokens(self, params: Dict) -> int:
+        """Rough input token count (about 4 characters per token)."""
+        return sum(
+            len(block["text"])
+            for message in params["messages"]
+            for block in message["content"]
+        ) // 4
+    
+    def _build_role_prompt(self, role_description: str) -> str:
+        """Build the role part of the analysis prompt (same for every item)."""
         return f"""You are analyzing a bulletin item from a university (JKU Linz, Austria) to determine if it's relevant for a specific person.
 
 ## THE PERSON'S ROLE AND INTERESTS:
 {role_description}
 
-## BULLETIN ITEM DETAILS:
+"""
+    
+    def _build_item_prompt(self, content: str, item_title: str, category: str) -> str:
+        """Build the item part of the analysis prompt."""
+        return f"""## BULLETIN ITEM DETAILS:
 Category: {category or "Not specified"}
 Title: {item_title or "Not specified"}
 
 ## CONTENT:
-{content[:50000]}  <!-- Truncated for safety -->
+{(content or "")[:50000]}  <!-- Truncated for safety -->
 
 ## YOUR TASK:
 1. Analyze whether this bulletin item is relevant to the person based on their role and interests.
@@ -97,25 +288,17 @@ Be concise. The person will use this to quickly filter through many bulletin ite
         explanation = response
         
         # Extract score
-        score_match = re.search(r'SCORE:\s*(\d+(?:\.\d+)?)', response, re.IGNORECASE)
+        score_match = _SCORE_RE.search(response)
         if score_match:
             score = min(100.0, max(0.0, float(score_match.group(1))))
         
         # Extract explanation
-        explanation_match = re.search(
-            r'EXPLANATION:\s*(.+?)(?=KEY_POINTS:|$)',
-            response,
-            re.IGNORECASE | re.DOTALL
-        )
+        explanation_match = _EXPLANATION_RE.search(response)
         if explanation_match:
             explanation = explanation_match.group(1).strip()
         
         # Add key points if present
-        key_points_match = re.search(
-            r'KEY_POINTS:\s*(.+?)$',
-            response,
-            re.IGNORECASE | re.DOTALL
-        )
+        key_points_match = _KEY_POINTS_RE.search(response)
         if key_points_match:
             key_points = key_points_match.group(1).strip()
             if key_points and key_points.lower() not in ['none', 'n/a', '-']:
@@ -126,25 +309,117 @@ Be concise. The person will use this to quickly filter through many bulletin ite
     def batch_analyze(
         self,
         items: List[Dict],
-        role_description: str
+        role_description: str,
+        max_concurrency: int = 5,
+        force: bool = False
     ) -> List[Tuple[float, str]]:
         """
-        Analyze multiple items efficiently.
+        Analyze multiple items concurrently.
         
+        At most max_concurrency requests are in flight at once.
+        Results are returned in the same order as items.
         Each item should have: content, title, category
+        With force=True cached results are ignored.
         """
-        results = []
+        return asyncio.run(
+            self._batch_analyze_async(items, role_description, max_concurrency, force)
+        )
+    
+    async def _batch_analyze_async(
+        self,
+        items: List[Dict],
+        role_description: str,
+        max_concurrency: int,
+        force: bool
+    ) -> List[Tuple[float, str]]:
+        """Run analyze_item_async for all items, bounded by a semaphore."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # The async client is bound to this event loop, so it lives per call
+        async with anthropic.AsyncAnthropic(
+            api_key=self.api_key,
+            http_client=anthropic.DefaultAsyncHttpxClient(limits=CONNECTION_LIMITS)
+        ) as client:
+            async def analyze(item: Dict) -> Tuple[float, str]:
+                async with semaphore:
+                    return await self.analyze_item_async(
+                        client,
+                        content=item.get('content', ''),
+                        role_description=role_description,
+                        item_title=item.get('title', ''),
+                        category=item.get('category', ''),
+                        force=force
+                    )
+            
+            return list(await asyncio.gather(*(analyze(item) for item in items)))
+    
+    def analyze_message_batch(
+        self,
+        items: List[Dict],
+        role_description: str,
+        poll_interval: float = 20.0,
+        force: bool = False
+    ) -> List[Tuple[float, str]]:
+        """
+        Analyze multiple items with a single Message Batches API request.
         
+        Batches are billed at half price but are processed asynchronously,
+        so this blocks (polling every poll_interval seconds) until the batch
+        has ended. Empty items and cached results are not submitted; with
+        force=True cached results are ignored.
+        Each item should have: content, title, category
+        """
+        keys = []
+        results = []
         for item in items:
-            score, explanation = self.analyze_item(
-                content=item.get('content', ''),
-                role_description=role_description,
-                item_title=item.get('title', ''),
-                category=item.get('category', '')
+            key, result = self._precheck(
+                item.get('content', ''),
+                role_description,
+                item.get('title', ''),
+                item.get('category', ''),
+                force
             )
-            results.append((score, explanation))
+            keys.append(key)
+            results.append(result)
         
-        return results
+        batch_requests = [
+            {
+                "custom_id": f"item-{index}",
+                "params": self._message_params(
+                    item.get('content', ''),
+                    role_description,
+                    item.get('title', ''),
+                    item.get('category', '')
+                ),
+            }
+            for index, item in enumerate(items)
+            if results[index] is None
+        ]
+        if not batch_requests:
+            return results
+        
+        try:
+            batch = self.client.messages.batches.create(requests=batch_requests)
+            
+            while batch.processing_status != "ended":
+                time.sleep(poll_interval)
+                batch = self.client.messages.batches.retrieve(batch.id)
+            
+            for entry in self.client.messages.batches.results(batch.id):
+                index = int(entry.custom_id.split('-')[1])
+                if entry.result.type == "succeeded":
+                    results[index] = self._handle_response(keys[index], entry.result.message)
+                else:
+                    results[index] = (0.0, f"Error during analysis: batch request {entry.result.type}")
+            
+            return [
+                result or (0.0, "Error during analysis: no batch result returned")
+                for result in results
+            ]
+        
+        except Exception as e:
+            error = self._error_result(e)
+            return [result or error for result in results]
 
 
 class BulletinAnalyzer:
@@ -160,7 +435,14 @@ class BulletinAnalyzer:
             raise ValueError("anthropic_api_key is required in config")
         
         model = config.get('model', 'claude-3-5-haiku-20241022')
-        self.analyzer = RelevanceAnalyzer(api_key, model)
+        # Requests are only paced when a rate_limit section is configured
+        rate_limit = config.get('rate_limit') or {}
+        self.analyzer = RelevanceAnalyzer(
+            api_key,
+            model,
+            rpm=rate_limit.get('requests_per_minute'),
+            tpm=rate_limit.get('tokens_per_minute')
+        )
         
         self.role_description = config.get('role_description', '')
         if not self.role_description:
@@ -192,26 +474,29 @@ class BulletinAnalyzer:
             'scores': [],
         }
         
-        for item in items:
-            # Process content including attachments
-            processed = process_bulletin_item(
-                item.content or '',
-                item.attachments,
-                self.pdf_parser,
-                self.config.get('storage', {}).get('cache_dir', 'data/cache')
+        if self.config.get('use_batch_api', False):
+            # Submit the whole edition as one batch, then save all results
+            analyses = self.analyzer.analyze_message_batch(
+                [self._item_for_analysis(item) for item in items],
+                self.role_description,
+                poll_interval=self.config.get('batch_poll_interval', 20),
+                force=force
             )
-            
-            # Analyze with AI
-            score, explanation = self.analyzer.analyze_item(
-                content=processed['combined_text'],
-                role_description=self.role_description,
-                item_title=item.title or '',
-                category=item.category or ''
+        else:
+            analyses = self.analyzer.batch_analyze(
+                [self._item_for_analysis(item) for item in items],
+                self.role_description,
+                max_concurrency=self.config.get('max_concurrency', 5),
+                force=force
             )
-            
-            # Save results
-            self.storage.update_item_analysis(item, score, explanation)
-            
+        
+        # Save all results in one transaction
+        self.storage.update_items_analysis([
+            (item, score, explanation)
+            for item, (score, explanation) in zip(items, analyses)
+        ])
+        
+        for item, (score, explanation) in zip(items, analyses):
             results['scores'].append(score)
             if score >= self.config.get('relevance_threshold', 60):
                 results['relevant'] += 1
@@ -225,6 +510,21 @@ class BulletinAnalyzer:
         results['avg_score'] = sum(results['scores']) / len(results['scores']) if results['scores'] else 0
         return results
     
+    def _item_for_analysis(self, item: BulletinItem) -> Dict:
+        """Process an item's content and attachments into analyzer input."""
+        processed = process_bulletin_item(
+            item.content or '',
+            item.attachments,
+            self.pdf_parser,
+            self.config.get('storage', {}).get('cache_dir', 'data/cache'),
+            processor=self.processor
+        )
+        return {
+            'content': processed['combined_text'],
+            'title': item.title or '',
+            'category': item.category or '',
+        }
+    
     def analyze_unprocessed(self) -> Dict:
         """Analyze all editions that have been scraped but not analyzed."""
         editions = self.storage.get_unanalyzed_editions()
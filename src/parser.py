@@ -11,6 +11,29 @@ from pathlib import Path
 import pdfplumber
 from PyPDF2 import PdfReader
 
+# Text cleanup
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+_PAGE_HEADER_RE = re.compile(r'^(Seite|Page)\s*\d+\s*(von|of)?\s*\d*$', re.IGNORECASE)
+_PAGE_NUMBER_RE = re.compile(r'^\d+\s*$')
+
+# Key information in bulletin text
+_DATE_RES = [
+    re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4})'),
+    re.compile(r'(\d{4})-(\d{2})-(\d{2})'),
+]
+_ECTS_RE = re.compile(r'(\d+)\s*ECTS', re.IGNORECASE)
+_PROGRAM_RES = [
+    re.compile(r'(Bachelor|Master|Diplom|Doktorat)[a-zä]*studium\s+([A-Za-zäöüÄÖÜß\s]+)', re.IGNORECASE),
+    re.compile(r'(BS|MS|PhD)\s+([A-Za-zäöüÄÖÜß\s]+)', re.IGNORECASE),
+]
+_DEADLINE_RES = [
+    re.compile(r'(Frist|Deadline|bis spätestens|until)[:\s]+(\d{1,2}\.\d{1,2}\.\d{4})', re.IGNORECASE),
+    re.compile(r'(\d{1,2}\.\d{1,2}\.\d{4})[,\s]*(Frist|Deadline)', re.IGNORECASE),
+]
+_SENTENCE_END_RE = re.compile(r'[.!?]\s+')
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w\-_.]')
+
 
 class PDFParser:
     """Parser for PDF documents."""
@@ -71,8 +94,8 @@ class PDFParser:
             return ""
         
         # Remove excessive whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r' {2,}', ' ', text)
+        text = _BLANK_LINES_RE.sub('\n\n', text)
+        text = _MULTI_SPACE_RE.sub(' ', text)
         
         # Fix common OCR issues
         text = text.replace('ﬁ', 'fi')
@@ -86,9 +109,9 @@ class PDFParser:
         
         for line in lines:
             # Skip likely headers/footers
-            if re.match(r'^(Seite|Page)\s*\d+\s*(von|of)?\s*\d*$', line.strip(), re.IGNORECASE):
+            if _PAGE_HEADER_RE.match(line.strip()):
                 continue
-            if re.match(r'^\d+\s*$', line.strip()):  # Just a page number
+            if _PAGE_NUMBER_RE.match(line.strip()):  # Just a page number
                 continue
             
             # Skip repeated short lines (likely headers)
@@ -169,35 +192,20 @@ class ContentProcessor:
         }
         
         # Extract dates
-        date_patterns = [
-            r'(\d{1,2})\.(\d{1,2})\.(\d{4})',
-            r'(\d{4})-(\d{2})-(\d{2})',
-        ]
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text)
-            info['dates'].extend(matches)
+        for pattern in _DATE_RES:
+            info['dates'].extend(pattern.findall(text))
         
         # Extract ECTS values
-        ects_matches = re.findall(r'(\d+)\s*ECTS', text, re.IGNORECASE)
-        info['ects'] = list(set(ects_matches))
+        info['ects'] = list(set(_ECTS_RE.findall(text)))
         
         # Extract study programs
-        program_patterns = [
-            r'(Bachelor|Master|Diplom|Doktorat)[a-zä]*studium\s+([A-Za-zäöüÄÖÜß\s]+)',
-            r'(BS|MS|PhD)\s+([A-Za-zäöüÄÖÜß\s]+)',
-        ]
-        for pattern in program_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in _PROGRAM_RES:
+            matches = pattern.findall(text)
             info['programs'].extend([f"{m[0]} {m[1].strip()}" for m in matches])
         
         # Extract deadlines
-        deadline_patterns = [
-            r'(Frist|Deadline|bis spätestens|until)[:\s]+(\d{1,2}\.\d{1,2}\.\d{4})',
-            r'(\d{1,2}\.\d{1,2}\.\d{4})[,\s]*(Frist|Deadline)',
-        ]
-        for pattern in deadline_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            info['deadlines'].extend(matches)
+        for pattern in _DEADLINE_RES:
+            info['deadlines'].extend(pattern.findall(text))
         
         return info
     
@@ -207,7 +215,7 @@ class ContentProcessor:
             return ""
         
         # Take first few sentences
-        sentences = re.split(r'[.!?]\s+', text)
+        sentences = _SENTENCE_END_RE.split(text)
         summary = ""
         
         for sentence in sentences:
@@ -226,17 +234,20 @@ def process_bulletin_item(
     item_content: str,
     attachments: List[Dict],
     pdf_parser: PDFParser,
-    cache_dir: str
+    cache_dir: str,
+    processor: Optional[ContentProcessor] = None
 ) -> Dict:
     """
     Process a bulletin item and its attachments.
     
+    Pass a processor to reuse it across items; otherwise a new one is created.
+    
     Returns dict with:
     - combined_text: All text content combined
     - extracted_info: Key extracted information
     - attachment_texts: List of text from each attachment
     """
-    processor = ContentProcessor()
+    processor = processor or ContentProcessor()
     attachment_texts = []
     
     # Process each attachment
@@ -247,7 +258,7 @@ def process_bulletin_item(
         elif att.get('type') == 'pdf':
             # Download and process
             filename = att.get('filename', 'document.pdf')
-            safe_filename = re.sub(r'[^\w\-_.]', '_', filename)
+            safe_filename = _UNSAFE_FILENAME_RE.sub('_', filename)
             local_path = os.path.join(cache_dir, safe_filename)
             
             # Note: actual download would happen in scraper
@@ -0,0 +1,90 @@
+"""
+Rate limiting for Anthropic API calls.
+Paces requests before they are sent instead of backing off after a 429.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Defaults for a limit that is configured without an explicit value
+DEFAULT_RPM = 40
+DEFAULT_TPM = 16000
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_min."""
+
+    def __init__(self, rate_per_min: float, capacity: Optional[float] = None):
+        """Initialize a full bucket; capacity defaults to one minute's worth."""
+        self.rate_per_sec = rate_per_min / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_min
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1) -> float:
+        """
+        Take amount tokens from the bucket.
+
+        The bucket may go into debt, so callers reserve in arrival order.
+        Returns the number of seconds to wait before the tokens are covered.
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate_per_sec
+            )
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_sec
+
+    def acquire(self, amount: float = 1):
+        """Block until amount tokens are available."""
+        wait = self.reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """Combined requests-per-minute and tokens-per-minute limiter."""
+
+    def __init__(self, rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM):
+        """Initialize with per-minute request and input token budgets."""
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+    def reserve(self, estimated_tokens: int) -> float:
+        """Reserve one request and its tokens; returns seconds to wait."""
+        return max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+
+    def acquire(self, estimated_tokens: int):
+        """Block until a request of estimated_tokens may be sent."""
+        wait = self.reserve(estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, estimated_tokens: int):
+        """Async variant of acquire that does not block the event loop."""
+        wait = self.reserve(estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# One limiter per (rpm, tpm), so analyzers with the same limits share quota
+_rate_limiters: Dict[Tuple[int, int], RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM) -> RateLimiter:
+    """Get or create the rate limiter for these limits."""
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get((rpm, tpm))
+        if limiter is None:
+            limiter = _rate_limiters[(rpm, tpm)] = RateLimiter(rpm, tpm)
+        return limiter
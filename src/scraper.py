@@ -7,17 +7,35 @@ import asyncio
 import json
 import re
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 import time
 
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import async_playwright, Browser, Page, Playwright
 
 from bs4 import BeautifulSoup
 import requests
 
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'  # C parser, much faster on the large edition pages
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
 from .storage import Storage, Edition, BulletinItem
 
+# Archive table: "MTB 3/2026" or "SONDERNUMMER - MTB 63/2025", dates as DD.MM.YYYY
+_MTB_NUMBER_RE = re.compile(r'MTB\s+(\d+)/(\d{4})')
+_MTB_TITLE_RE = re.compile(r'((?:SONDERNUMMER[^-]*-\s*)?MTB\s+\d+/\d{4})')
+_DATE_RE = re.compile(r'(\d{2})\.(\d{2})\.(\d{4})')
+
+# Edition page text: "Pkt.: 45" and "Kategorie: Satzung"
+_PUNKT_RE = re.compile(r'Pkt\.:\s*(\d+)')
+_KATEGORIE_RE = re.compile(r'Kategorie:\s*([^\n]+)')
+
+# Attachment download links
+_DOWNLOAD_LINK_RE = re.compile(r'downloadIxServlet')
+
 
 class MTBScraper:
     """Scraper for the JKU Mitteilungsblatt Intrexx portal."""
@@ -30,24 +48,41 @@ class MTBScraper:
         """Initialize scraper with storage and configuration."""
         self.storage = storage
         self.config = config
+        self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
         self.headless = config.get('scraping', {}).get('headless', True)
         self.delay_between_requests = config.get('scraping', {}).get('delay_seconds', 2)
+        self.max_concurrent_editions = config.get('scraping', {}).get('max_concurrent_editions', 3)
     
     async def _init_browser(self):
         """Initialize Playwright browser."""
         if self.browser is None:
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(headless=self.headless)
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=self.headless)
     
     async def _new_page(self) -> Page:
-        """Create a new browser page with proper settings."""
+        """
+        Create a new browser page with proper settings.
+        
+        Each page gets its own context (cookies, portal session), so pages
+        scraped concurrently don't interfere. Close it with _close_page.
+        """
         await self._init_browser()
         context = await self.browser.new_context(
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         )
-        page = await context.new_page()
-        return page
+        return await context.new_page()
+    
+    async def _close_page(self, page: Page):
+        """Close a page together with its browser context."""
+        await page.context.close()
+    
+    async def _run_and_close(self, coro: Awaitable):
+        """Await coro, then close the browser (it is bound to this event loop)."""
+        try:
+            return await coro
+        finally:
+            await self.close()
     
     async def _wait_and_delay(self):
         """Wait between requests to be respectful to the server."""
@@ -152,11 +187,11 @@ class MTBScraper:
             return editions
         
         finally:
-            await page.close()
+            await self._close_page(page)
     
     def _parse_archive_table(self, html_content: str) -> List[Dict]:
         """Parse the archive table to extract edition information."""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         editions = []
         
         # Find all table rows with edition data
@@ -172,20 +207,21 @@ class MTBScraper:
                     continue
             
             short_name = cells[0].get_text(strip=True)
-            date_str = cells[1].get_text(strip=True)
-            year_str = cells[2].get_text(strip=True)
             
             # Parse MTB number from short name (e.g., "MTB 3/2026" or "SONDERNUMMER - MTB 63/2025")
-            mtb_match = re.search(r'MTB\s+(\d+)/(\d{4})', short_name)
+            # Non-edition rows are skipped before reading the other cells
+            mtb_match = _MTB_NUMBER_RE.search(short_name)
             if not mtb_match:
                 continue
             
+            date_str = cells[1].get_text(strip=True)
+            
             stueck = int(mtb_match.group(1))
             year = int(mtb_match.group(2))
             
             # Parse publication date (format: DD.MM.YYYY)
             published_date = None
-            date_match = re.search(r'(\d{2})\.(\d{2})\.(\d{4})', date_str)
+            date_match = _DATE_RE.search(date_str)
             if date_match:
                 try:
                     published_date = datetime(
@@ -204,7 +240,7 @@ class MTBScraper:
             
             # Extract clean title - just the MTB designation part
             # Look for patterns like "MTB 3/2026" or "SONDERNUMMER - MTB 63/2025"
-            title_match = re.search(r'((?:SONDERNUMMER[^-]*-\s*)?MTB\s+\d+/\d{4})', short_name)
+            title_match = _MTB_TITLE_RE.search(short_name)
             clean_title = title_match.group(1) if title_match else f"MTB {stueck}/{year}"
             
             editions.append({
@@ -221,7 +257,9 @@ class MTBScraper:
     
     def scan_and_store(self, from_date: datetime = None, to_date: datetime = None) -> int:
         """Discover editions and store new ones in the database."""
-        editions = asyncio.run(self.discover_editions(from_date=from_date, to_date=to_date))
+        editions = asyncio.run(self._run_and_close(
+            self.discover_editions(from_date=from_date, to_date=to_date)
+        ))
         new_count = 0
         
         for ed in editions:
@@ -309,7 +347,7 @@ class MTBScraper:
             return items
         
         finally:
-            await page.close()
+            await self._close_page(page)
     
     def _extract_row_content_with_links(self, row) -> str:
         """
@@ -368,7 +406,7 @@ class MTBScraper:
         - Row 7: Signature ("DER REKTOR: Koch")
         - Row 8: Attachments ("Keine Anhänge" or "Anhänge anzeigen (N)")
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         items = []
         
         # Find all cells that contain exactly "Pkt.:" as their text
@@ -491,17 +529,14 @@ class MTBScraper:
     async def _extract_items_alternative(self, page: Page) -> List[Dict]:
         """Alternative method to extract items using BeautifulSoup."""
         content = await page.content()
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, HTML_PARSER)
         items = []
         
         # Find all text containing "Pkt.:" 
         all_text = soup.get_text()
         
         # Find patterns like "Pkt.: 45" and "Kategorie: Satzung"
-        punkt_pattern = re.compile(r'Pkt\.:\s*(\d+)')
-        kategorie_pattern = re.compile(r'Kategorie:\s*([^\n]+)')
-        
-        punkt_matches = list(punkt_pattern.finditer(all_text))
+        punkt_matches = list(_PUNKT_RE.finditer(all_text))
         
         for i, match in enumerate(punkt_matches):
             punkt = int(match.group(1))
@@ -512,7 +547,7 @@ class MTBScraper:
             section = all_text[start_pos:end_pos]
             
             # Extract category
-            kat_match = kategorie_pattern.search(section)
+            kat_match = _KATEGORIE_RE.search(section)
             category = kat_match.group(1).strip() if kat_match else ''
             
             # Extract title and content from the section
@@ -560,7 +595,7 @@ class MTBScraper:
             
             # Get the initial page content to find attachment buttons and their context
             content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
+            soup = BeautifulSoup(content, HTML_PARSER)
             
             # Find all attachment buttons and their parent context
             # The "Anhänge anzeigen" buttons are actually links with role="button" and title="Anhänge anzeigen"
@@ -603,10 +638,10 @@ class MTBScraper:
                     # Look for the attachment link in the dialog
                     # The dialog contains links with downloadIxServlet in the URL
                     dialog_content = await page.content()
-                    dialog_soup = BeautifulSoup(dialog_content, 'html.parser')
+                    dialog_soup = BeautifulSoup(dialog_content, HTML_PARSER)
                     
                     # Find download links in the dialog
-                    download_links = dialog_soup.find_all('a', href=re.compile(r'downloadIxServlet'))
+                    download_links = dialog_soup.find_all('a', href=_DOWNLOAD_LINK_RE)
                     
                     for link in download_links:
                         href = link.get('href', '')
@@ -659,25 +694,64 @@ class MTBScraper:
         except Exception as e:
             print(f"  Warning: Could not extract attachments: {e}")
     
-    def scrape_and_store(self, edition: Edition) -> int:
+    async def _scrape_and_store_async(self, edition: Edition) -> int:
         """Scrape an edition and store its items."""
-        items = asyncio.run(self.scrape_edition(edition))
+        items = await self.scrape_edition(edition)
         
-        # Add items directly to session (they're already BulletinItem objects)
-        for item in items:
-            self.storage.session.add(item)
-        
-        # Update edition as scraped
+        # Mark edition as scraped and store all items in one transaction
         edition.scraped_at = datetime.now()
-        self.storage.session.commit()
+        self.storage.add_items(items)
         
         return len(items)
     
+    def scrape_and_store(self, edition: Edition) -> int:
+        """Scrape an edition and store its items."""
+        return asyncio.run(self._run_and_close(self._scrape_and_store_async(edition)))
+    
+    def scrape_and_store_editions(
+        self,
+        editions: List[Edition],
+        on_progress: Optional[Callable[[Edition, int, Optional[Exception]], None]] = None
+    ) -> int:
+        """
+        Scrape several editions in one browser session.
+        
+        Up to max_concurrent_editions editions are scraped at once, each in
+        its own page. A failed edition doesn't stop the run; after each
+        edition on_progress(edition, item_count, error) is called.
+        Returns the number of editions scraped successfully.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_editions)
+        
+        async def scrape_one(edition: Edition) -> bool:
+            async with semaphore:
+                try:
+                    count = await self._scrape_and_store_async(edition)
+                except Exception as e:
+                    if on_progress:
+                        on_progress(edition, 0, e)
+                    return False
+            if on_progress:
+                on_progress(edition, count, None)
+            return True
+        
+        async def scrape_all() -> int:
+            # Start the browser before fanning out, so concurrent pages
+            # don't each launch (and leak) their own
+            await self._init_browser()
+            results = await asyncio.gather(*(scrape_one(edition) for edition in editions))
+            return sum(results)
+        
+        return asyncio.run(self._run_and_close(scrape_all()))
+    
     async def close(self):
-        """Close the browser."""
+        """Close the browser and Playwright."""
         if self.browser:
             await self.browser.close()
             self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
 
 
 def get_scraper(storage: Storage, config: dict) -> MTBScraper:
@@ -694,7 +768,9 @@ def run_scraper(storage: Storage, config: dict, from_date: datetime = None, to_d
     scraper = MTBScraper(storage, config)
     
     # Discover editions
-    editions = asyncio.run(scraper.discover_editions(from_date=from_date, to_date=to_date))
+    editions = asyncio.run(scraper._run_and_close(
+        scraper.discover_editions(from_date=from_date, to_date=to_date)
+    ))
     
     # Store new editions
     new_count = 0
@@ -745,3 +821,19 @@ def scrape_edition(storage: Storage, config: dict, year: int, stueck: int) -> Tu
     items = storage.get_items_for_edition(edition)
     
     return edition, items
+
+
+def scrape_editions(
+    storage: Storage,
+    config: dict,
+    editions: List[Edition],
+    on_progress: Optional[Callable[[Edition, int, Optional[Exception]], None]] = None
+) -> int:
+    """
+    Scrape several editions and store their items, reusing one browser.
+    
+    Returns the number of editions scraped successfully; see
+    MTBScraper.scrape_and_store_editions for on_progress.
+    """
+    scraper = MTBScraper(storage, config)
+    return scraper.scrape_and_store_editions(editions, on_progress)
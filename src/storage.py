@@ -4,10 +4,10 @@ Handles persistence of bulletin data, analysis results, and processing state.
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, func, case, cast
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, joinedload
 import json
 import os
 
@@ -183,11 +183,46 @@ class Storage:
         self.session.commit()
         return item
     
-    def get_relevant_items(self, threshold: float = 60.0) -> List[BulletinItem]:
-        """Get all items with relevance score above threshold."""
-        return self.session.query(BulletinItem).filter(
+    def add_items(self, items: List[BulletinItem]) -> List[BulletinItem]:
+        """Add several items in a single transaction."""
+        self.session.add_all(items)
+        self.session.commit()
+        return items
+    
+    def get_relevant_items(self, threshold: float = 60.0, limit: Optional[int] = None) -> List[BulletinItem]:
+        """Get items with relevance score above threshold, best first."""
+        # Listings show each item's edition, so load it in the same query
+        query = self.session.query(BulletinItem).options(
+            joinedload(BulletinItem.edition)
+        ).filter(
+            BulletinItem.relevance_score >= threshold
+        ).order_by(BulletinItem.relevance_score.desc())
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+    
+    def get_relevant_item_rows(self, threshold: float = 60.0, limit: Optional[int] = None) -> List[Any]:
+        """
+        Get relevant items as plain rows with only the columns listings display.
+        
+        Cheaper than get_relevant_items for templates: no ORM objects are built
+        and long explanations are cut to the 100-character preview (+1 so the
+        template can still tell whether to add an ellipsis).
+        """
+        query = self.session.query(
+            BulletinItem.id,
+            BulletinItem.punkt,
+            BulletinItem.title,
+            BulletinItem.category,
+            BulletinItem.relevance_score,
+            func.substr(BulletinItem.relevance_explanation, 1, 101).label('relevance_explanation'),
+            (cast(Edition.year, String) + '-' + cast(Edition.stueck, String)).label('edition_label'),
+        ).join(BulletinItem.edition).filter(
             BulletinItem.relevance_score >= threshold
-        ).order_by(BulletinItem.relevance_score.desc()).all()
+        ).order_by(BulletinItem.relevance_score.desc())
+        if limit:
+            query = query.limit(limit)
+        return query.all()
     
     def get_items_for_edition(self, edition: Edition) -> List[BulletinItem]:
         """Get all items for an edition."""
@@ -223,6 +258,15 @@ class Storage:
         item.analyzed_at = datetime.now()
         self.session.commit()
     
+    def update_items_analysis(self, analyses: List[Tuple[BulletinItem, float, str]]):
+        """Update analysis results for several items in a single transaction."""
+        now = datetime.now()
+        for item, score, explanation in analyses:
+            item.relevance_score = score
+            item.relevance_explanation = explanation
+            item.analyzed_at = now
+        self.session.commit()
+    
     # Attachment methods
     
     def add_attachment(self, item_id: int, **kwargs) -> Attachment:
@@ -241,23 +285,20 @@ class Storage:
     
     # Statistics
     
-    def get_stats(self) -> Dict[str, Any]:
+    def get_stats(self, threshold: float = 60.0) -> Dict[str, Any]:
         """Get summary statistics."""
-        total_editions = self.session.query(Edition).count()
-        scraped_editions = self.session.query(Edition).filter(
-            Edition.scraped_at.isnot(None)
-        ).count()
-        analyzed_editions = self.session.query(Edition).filter(
-            Edition.analyzed_at.isnot(None)
-        ).count()
+        # COUNT(column) skips NULLs, so each table needs only one query
+        total_editions, scraped_editions, analyzed_editions = self.session.query(
+            func.count(Edition.id),
+            func.count(Edition.scraped_at),
+            func.count(Edition.analyzed_at),
+        ).one()
         
-        total_items = self.session.query(BulletinItem).count()
-        analyzed_items = self.session.query(BulletinItem).filter(
-            BulletinItem.analyzed_at.isnot(None)
-        ).count()
-        relevant_items = self.session.query(BulletinItem).filter(
-            BulletinItem.relevance_score >= 60
-        ).count()
+        total_items, analyzed_items, relevant_items = self.session.query(
+            func.count(BulletinItem.id),
+            func.count(BulletinItem.analyzed_at),
+            func.count(case((BulletinItem.relevance_score >= threshold, 1))),
+        ).one()
         
         return {
             "total_editions": total_editions,
@@ -267,6 +308,13 @@ class Storage:
             "analyzed_items": analyzed_items,
             "relevant_items": relevant_items,
         }
+    
+    def get_dashboard_data(self, threshold: float = 60.0, limit: int = 10) -> Dict[str, Any]:
+        """Get statistics and the top relevant items for the dashboard in one call."""
+        return {
+            "stats": self.get_stats(threshold),
+            "recent_items": self.get_relevant_item_rows(threshold, limit=limit),
+        }
 
 
 # Singleton-like access
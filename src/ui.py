@@ -5,7 +5,9 @@ Provides both terminal (Rich) and web (Flask) interfaces.
 
 import threading
 import os
-import yaml
+from collections import deque
+import re
+import traceback
 from datetime import datetime
 from typing import List, Optional
 
@@ -15,9 +17,17 @@ from rich.panel import Panel
 from rich.text import Text
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from flask import Flask, render_template_string, request, jsonify, redirect, url_for
+from flask import Flask, render_template, request, jsonify, redirect, url_for, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from jinja2 import DictLoader
+
+try:
+    import orjson
+except ImportError:  # Optional - falls back to Flask's stdlib json provider
+    orjson = None
 
 from .storage import Storage, Edition, BulletinItem, get_storage
+from .yaml_io import load_yaml, dump_yaml
 
 
 # Terminal UI using Rich
@@ -190,31 +200,36 @@ def create_progress():
 task_status = {
     'running': False,
     'task': None,
-    'logs': [],
+    'logs': deque(maxlen=100),  # Keeps only the last 100 logs
     'progress': 0,
     'total': 0,
     'error': None
 }
 task_lock = threading.Lock()
 
+# Serialized /api/task-status body, rebuilt only after the status changes
+_task_status_cache = {'body': None}
+
 # Store config path globally for updates
 config_path = 'config.yaml'
 
 
+def _mark_task_status_changed():
+    """Drop the cached status response. Caller must hold task_lock."""
+    _task_status_cache['body'] = None
+
+
 def add_log(message: str):
     """Add a log message to the task status."""
     with task_lock:
         timestamp = datetime.now().strftime("%H:%M:%S")
         task_status['logs'].append(f"[{timestamp}] {message}")
-        # Keep only last 100 logs
-        if len(task_status['logs']) > 100:
-            task_status['logs'] = task_status['logs'][-100:]
+        _mark_task_status_changed()
 
 
 def run_scan_task(config: dict, date_from: str = None, date_to: str = None):
     """Run the scan task in background."""
     from .scraper import run_scraper
-    from datetime import datetime
     
     try:
         add_log("Starting scan for new editions...")
@@ -257,22 +272,23 @@ def run_scan_task(config: dict, date_from: str = None, date_to: str = None):
         with task_lock:
             task_status['running'] = False
             task_status['task'] = None
+            _mark_task_status_changed()
         
         add_log("Scan complete!")
         storage.close()
         
     except Exception as e:
-        import traceback
         add_log(f"ERROR: {str(e)}")
         add_log(f"Traceback: {traceback.format_exc()}")
         with task_lock:
             task_status['running'] = False
             task_status['error'] = str(e)
+            _mark_task_status_changed()
 
 
 def run_scrape_task(config: dict, edition_id: str = None, date_from: str = None, date_to: str = None):
     """Run the scrape task in background."""
-    from .scraper import scrape_edition
+    from .scraper import scrape_edition, scrape_editions
     
     try:
         db_path = config.get('storage', {}).get('database', 'data/mtb.db')
@@ -318,23 +334,26 @@ def run_scrape_task(config: dict, edition_id: str = None, date_from: str = None,
                 with task_lock:
                     task_status['total'] = len(unscraped)
                     task_status['progress'] = 0
+                    _mark_task_status_changed()
                 
                 add_log(f"Scraping {len(unscraped)} editions...")
                 
-                for i, ed in enumerate(unscraped):
-                    add_log(f"Scraping {ed.edition_id}...")
-                    try:
-                        scrape_edition(storage, config, ed.year, ed.stueck)
-                        add_log(f"  ✓ {ed.edition_id} done")
-                    except Exception as e:
-                        add_log(f"  ✗ {ed.edition_id} failed: {str(e)}")
+                def report(ed, num_items, error):
+                    if error:
+                        add_log(f"  ✗ {ed.edition_id} failed: {str(error)}")
+                    else:
+                        add_log(f"  ✓ {ed.edition_id} done ({num_items} items)")
                     
                     with task_lock:
-                        task_status['progress'] = i + 1
+                        task_status['progress'] += 1
+                        _mark_task_status_changed()
+                
+                scrape_editions(storage, config, unscraped, on_progress=report)
         
         with task_lock:
             task_status['running'] = False
             task_status['task'] = None
+            _mark_task_status_changed()
         
         add_log("Scraping complete!")
         storage.close()
@@ -344,6 +363,7 @@ def run_scrape_task(config: dict, edition_id: str = None, date_from: str = None,
         with task_lock:
             task_status['running'] = False
             task_status['error'] = str(e)
+            _mark_task_status_changed()
 
 
 def run_analyze_task(config: dict, edition_id: str = None):
@@ -375,6 +395,7 @@ def run_analyze_task(config: dict, edition_id: str = None):
                 with task_lock:
                     task_status['total'] = len(unanalyzed)
                     task_status['progress'] = 0
+                    _mark_task_status_changed()
                 
                 add_log(f"Analyzing {len(unanalyzed)} editions...")
                 
@@ -390,10 +411,12 @@ def run_analyze_task(config: dict, edition_id: str = None):
                     
                     with task_lock:
                         task_status['progress'] = i + 1
+                        _mark_task_status_changed()
         
         with task_lock:
             task_status['running'] = False
             task_status['task'] = None
+            _mark_task_status_changed()
         
         add_log("Analysis complete!")
         storage.close()
@@ -403,12 +426,33 @@ def run_analyze_task(config: dict, edition_id: str = None):
         with task_lock:
             task_status['running'] = False
             task_status['error'] = str(e)
+            _mark_task_status_changed()
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes API responses with orjson."""
+    
+    # Non-str keys are converted to strings and datetimes are passed to
+    # self.default (HTTP date format), matching the stdlib provider's output
+    OPTIONS = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if orjson is not None else 0
+    )
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.OPTIONS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 
 def create_web_app(storage: Storage, config: dict) -> Flask:
     """Create Flask web application."""
     app = Flask(__name__)
     
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+    
     # Store config reference for updates
     app.config['mtb_config'] = config
     
@@ -1190,7 +1234,7 @@ def create_web_app(storage: Storage, config: dict) -> Flask:
         </tr>
         {% for item in recent_items %}
         <tr class="clickable" onclick="window.location='/item/{{ item.id }}'">
-            <td>{{ item.edition.edition_id if item.edition else '?' }}</td>
+            <td>{{ item.edition_label }}</td>
             <td>{{ item.category or '-' }}</td>
             <td>{{ item.title[:60] if item.title else '-' }}{% if item.title and item.title|length > 60 %}...{% endif %}</td>
             <td><span class="score {{ 'score-high' if item.relevance_score >= 80 else ('score-medium' if item.relevance_score >= 60 else 'score-low') }}">
@@ -1326,7 +1370,7 @@ def create_web_app(storage: Storage, config: dict) -> Flask:
             </tr>
             {% for item in items %}
         <tr class="clickable" onclick="window.location='/item/{{ item.id }}'">
-                <td>{{ item.edition.edition_id if item.edition else '?' }}</td>
+                <td>{{ item.edition_label }}</td>
             <td style="font-weight: 600; color: var(--accent-color);">{{ item.punkt or '-' }}</td>
                 <td>{{ item.category or '-' }}</td>
             <td>{{ item.title[:50] if item.title else '-' }}{% if item.title and item.title|length > 50 %}...{% endif %}</td>
@@ -1442,27 +1486,42 @@ def create_web_app(storage: Storage, config: dict) -> Flask:
     {% endblock %}
     '''
     
+    # Register each page once so Jinja compiles it a single time and serves
+    # later requests from its template cache instead of re-parsing the source.
+    app.jinja_loader = DictLoader({
+        name: BASE_TEMPLATE.replace('{% block content %}{% endblock %}', content)
+        for name, content in [
+            ('dashboard.html', DASHBOARD_CONTENT),
+            ('editions.html', EDITIONS_CONTENT),
+            ('relevant.html', RELEVANT_CONTENT),
+            ('item_detail.html', ITEM_DETAIL_CONTENT),
+        ]
+    })
+    
+    def stream_page(template_name: str, **context):
+        """Stream a page to the client while it renders (for long listings)."""
+        app.update_template_context(context)
+        stream = app.jinja_env.get_template(template_name).stream(context)
+        stream.enable_buffering(5)
+        return app.response_class(stream_with_context(stream), mimetype='text/html')
+    
     @app.route('/')
     def dashboard():
-        stats = storage.get_stats()
-        recent_items = storage.get_relevant_items(threshold=60)[:10]
+        data = storage.get_dashboard_data(threshold=60, limit=10)
         role_description = config.get('role_description', '')
-        template = BASE_TEMPLATE.replace('{% block content %}{% endblock %}', DASHBOARD_CONTENT)
-        return render_template_string(template, stats=stats, recent_items=recent_items, 
-                                      role_description=role_description, active_page='dashboard')
+        return render_template('dashboard.html', stats=data['stats'], recent_items=data['recent_items'], 
+                               role_description=role_description, active_page='dashboard')
     
     @app.route('/editions')
     def editions():
         editions_list = storage.get_all_editions()
-        template = BASE_TEMPLATE.replace('{% block content %}{% endblock %}', EDITIONS_CONTENT)
-        return render_template_string(template, editions=editions_list, active_page='editions')
+        return stream_page('editions.html', editions=editions_list, active_page='editions')
     
     @app.route('/relevant')
     def relevant():
         threshold = float(request.args.get('threshold', 60))
-        items = storage.get_relevant_items(threshold=threshold)
-        template = BASE_TEMPLATE.replace('{% block content %}{% endblock %}', RELEVANT_CONTENT)
-        return render_template_string(template, items=items, threshold=threshold, active_page='relevant')
+        items = storage.get_relevant_item_rows(threshold=threshold)
+        return stream_page('relevant.html', items=items, threshold=threshold, active_page='relevant')
     
     @app.route('/item/<int:item_id>')
     def item_detail(item_id):
@@ -1475,8 +1534,6 @@ def create_web_app(storage: Storage, config: dict) -> Flask:
         content_links = []
         content_text = content
         
-        import re
-        
         # Extract [Link: ...] URL: ... patterns (from our scraper annotation)
         link_pattern = r'\[Link:\s*([^\]]+)\]\s*\n?\s*URL:\s*(https?://[^\s\n]+)'
         matches = re.findall(link_pattern, content)
@@ -1554,11 +1611,10 @@ def create_web_app(storage: Storage, config: dict) -> Flask:
             else:
                 summary = explanation[:500] + ('...' if len(explanation) > 500 else '')
         
-        template = BASE_TEMPLATE.replace('{% block content %}{% endblock %}', ITEM_DETAIL_CONTENT)
-        return render_template_string(template, item=item, content_text=content_text, 
-                                      content_links=content_links, summary=summary,
-                                      key_points=key_points, reasoning=reasoning,
-                                      active_page='relevant')
+        return render_template('item_detail.html', item=item, content_text=content_text, 
+                               content_links=content_links, summary=summary,
+                               key_points=key_points, reasoning=reasoning,
+                               active_page='relevant')
     
     @app.route('/api/stats')
     def api_stats():
@@ -1567,20 +1623,25 @@ def create_web_app(storage: Storage, config: dict) -> Flask:
     @app.route('/api/task-status')
     def api_task_status():
         with task_lock:
-            return jsonify({
-                'running': task_status['running'],
-                'task': task_status['task'],
-                'logs': task_status['logs'][-50:],
-                'progress': task_status['progress'],
-                'total': task_status['total'],
-                'error': task_status['error']
-            })
+            body = _task_status_cache['body']
+            if body is None:
+                body = app.json.dumps({
+                    'running': task_status['running'],
+                    'task': task_status['task'],
+                    'logs': list(task_status['logs'])[-50:],
+                    'progress': task_status['progress'],
+                    'total': task_status['total'],
+                    'error': task_status['error']
+                })
+                _task_status_cache['body'] = body
+        return app.response_class(body, mimetype='application/json')
     
     @app.route('/api/clear-logs', methods=['POST'])
     def api_clear_logs():
         with task_lock:
-            task_status['logs'] = []
+            task_status['logs'].clear()
             task_status['error'] = None
+            _mark_task_status_changed()
         return jsonify({'cleared': True})
     
     @app.route('/api/save-role', methods=['POST'])
@@ -1596,12 +1657,12 @@ def create_web_app(storage: Storage, config: dict) -> Flask:
             config_file = config.get('_config_path', 'config.yaml')
             if os.path.exists(config_file):
                 with open(config_file, 'r') as f:
-                    file_config = yaml.safe_load(f)
+                    file_config = load_yaml(f)
                 
                 file_config['role_description'] = new_role
                 
                 with open(config_file, 'w') as f:
-                    yaml.dump(file_config, f, default_flow_style=False, allow_unicode=True)
+                    dump_yaml(file_config, f, default_flow_style=False, allow_unicode=True)
             
             return jsonify({'saved': True})
         except Exception as e:
@@ -1620,6 +1681,7 @@ def create_web_app(storage: Storage, config: dict) -> Flask:
             task_status['progress'] = 0
             task_status['total'] = 0
             task_status['error'] = None
+            _mark_task_status_changed()
         
         thread = threading.Thread(target=run_scan_task, args=(config, date_from, date_to))
         thread.daemon = True
@@ -1641,6 +1703,7 @@ def create_web_app(storage: Storage, config: dict) -> Flask:
             task_status['progress'] = 0
             task_status['total'] = 0
             task_status['error'] = None
+            _mark_task_status_changed()
         
         thread = threading.Thread(target=run_scrape_task, args=(config, edition_id, date_from, date_to))
         thread.daemon = True
@@ -1660,6 +1723,7 @@ def create_web_app(storage: Storage, config: dict) -> Flask:
             task_status['progress'] = 0
             task_status['total'] = 0
             task_status['error'] = None
+            _mark_task_status_changed()
         
         thread = threading.Thread(target=run_analyze_task, args=(config, edition_id))
         thread.daemon = True
@@ -1705,4 +1769,19 @@ def run_web_server(storage: Storage, config: dict, port: int = 8080):
     
     app = create_web_app(storage, config)
     console.print(f"[green]Starting web server at http://localhost:{port}[/green]")
+    
+    web_config = config.get('web', {})
+    if web_config.get('production_server', False):
+        try:
+            from waitress import serve
+        except ImportError:
+            console.print("[yellow]waitress is not installed, falling back to the development server[/yellow]")
+        else:
+            # Multi-threaded server with HTTP keep-alive
+            serve(app, host='0.0.0.0', port=port,
+                  threads=web_config.get('threads', 8),
+                  connection_limit=web_config.get('connection_limit', 1000),
+                  channel_timeout=web_config.get('channel_timeout', 120))
+            return
+    
     app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
@@ -0,0 +1,21 @@
+"""
+YAML reading and writing for the config file.
+Uses PyYAML's libyaml-backed loader/dumper when available.
+"""
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml - pure-Python loader/dumper
+    from yaml import SafeLoader, SafeDumper
+
+
+def load_yaml(stream):
+    """Parse a YAML document with the safe loader."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def dump_yaml(data, stream, **kwargs):
+    """Write data as YAML with the safe dumper."""
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)